@@ -7,21 +7,110 @@ Flask werd gekozen omdat het eenvoudig en lichtgewicht is, ideaal voor
 demo-doeleinden.
 """
 
-from flask import Flask, render_template, request, jsonify
-from typing import Dict, Any, List
-from data_sources.database_source import DatabaseSource
-from data_sources.csv_source import CSVSource
+from flask import (
+    Flask, Response, render_template, request, jsonify, stream_with_context
+)
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple
+from itertools import chain, islice
+from contextlib import closing
+from threading import Lock
+from cachetools import TTLCache
+import orjson
 from data_sources.base_source import BaseDataSource
 from models.product import Product
 import os
 import sys
+import time
+
+if TYPE_CHECKING:
+    import redis
+    from models.catalog import ProductCatalog
 
 app = Flask(__name__)
 
 # Configuratie
-DATABASE_PATH: str = 'data/products.db'
+DATABASE_PATH: str = os.environ.get('PRODUCTS_DB', 'data/products.db')
+# Een database in het geheugen bestaat enkel binnen het proces dat ze
+# vulde: elke server (of Gunicorn worker) zou een lege database zien
+if DATABASE_PATH == ':memory:':
+    raise RuntimeError(
+        "PRODUCTS_DB=:memory: wordt niet ondersteund door de applicatie; "
+        "gebruik een databasebestand"
+    )
 CSV_PATH: str = 'data/products.csv'
 
+# Aantal producten dat per fragment van een gestreamde response
+# geserialiseerd wordt
+STREAM_BATCH_SIZE: int = 100
+
+# Melding voor de client bij een onverwachte fout; de details gaan naar stderr
+UNEXPECTED_ERROR_MESSAGE: str = 'Er is een onverwachte fout opgetreden'
+
+# Afsluiting van een gestreamde response na een onverwachte, mogelijk
+# tijdelijke fout. Zo'n response wordt niet gecachet (zie _cache_stream).
+_STREAM_ERROR_END: bytes = (
+    b'],"success":false,"error":' + orjson.dumps(UNEXPECTED_ERROR_MESSAGE) + b'}'
+)
+
+# Mimetype voor de Apache Arrow IPC stream (kolomgebaseerd binair formaat)
+ARROW_STREAM_MIMETYPE: str = 'application/vnd.apache.arrow.stream'
+
+# /api/products kiest JSON of Arrow op basis van de Accept header: een
+# browser of gedeelde cache mag de ene vorm niet aan de andere client geven
+_VARY_ACCEPT: Dict[str, str] = {'Vary': 'Accept'}
+
+# Volledig geserialiseerde product responses, per databron en mtime van
+# het onderliggende bestand. TTLCache is niet thread-safe, vandaar de lock.
+RESPONSE_CACHE_TTL: int = 300
+# Grotere responses worden niet gebufferd en niet gecachet, zodat een
+# groot CSV bestand tijdens het streamen niet volledig in het geheugen (en
+# in Redis) belandt. TTLCache telt enkel entries, geen bytes.
+RESPONSE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024
+_RESP_CACHE: TTLCache = TTLCache(maxsize=4, ttl=RESPONSE_CACHE_TTL)
+_RESP_CACHE_LOCK: Lock = Lock()
+
+# Optionele gedeelde cache in Redis, zodat ook andere worker processen de
+# responses kunnen hergebruiken. Enkel actief als REDIS_URL gezet is,
+# bijvoorbeeld redis://localhost:6379/0
+REDIS_URL: Optional[str] = os.environ.get('REDIS_URL')
+_redis_client: Optional['redis.Redis'] = None
+
+if REDIS_URL:
+    # Pas hier importeren: zonder REDIS_URL is de redis package niet nodig
+    import redis
+    
+    _redis_client = redis.Redis.from_url(
+        REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+    )
+
+# Na een fout wordt Redis zo lang (seconden) overgeslagen, zodat een
+# onbereikbare server niet bij elk request opnieuw timeouts kost
+REDIS_RETRY_DELAY: float = 30.0
+# Tijdstip volgens time.monotonic() waarop Redis opnieuw geprobeerd wordt
+_redis_retry_at: float = 0.0
+
+
+def json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """
+    Bouw een JSON response met orjson.
+    
+    orjson serialiseert rechtstreeks naar bytes in native code. Dat is
+    merkbaar sneller dan de pure-Python json module achter jsonify
+    wanneer de productlijst groot wordt.
+    
+    Args:
+        payload: Te serialiseren data
+        status: HTTP status code
+    
+    Returns:
+        Response: Flask response met application/json mimetype
+    """
+    return Response(
+        orjson.dumps(payload),
+        status=status,
+        mimetype='application/json'
+    )
+
 
 def create_data_source(source_type: str) -> BaseDataSource:
     """
@@ -41,9 +130,13 @@ def create_data_source(source_type: str) -> BaseDataSource:
     """
     source_type = source_type.lower().strip()
     
+    # De implementaties worden pas hier geïmporteerd: een proces dat maar
+    # één databron gebruikt, laadt de andere (en sqlite3 of csv) nooit
     if source_type == 'csv':
+        from data_sources.csv_source import CSVSource
         return CSVSource(CSV_PATH)
     elif source_type == 'database':
+        from data_sources.database_source import DatabaseSource
         return DatabaseSource(DATABASE_PATH)
     else:
         raise ValueError(
@@ -52,6 +145,269 @@ def create_data_source(source_type: str) -> BaseDataSource:
         )
 
 
+def _source_mtime(source_type: str) -> Optional[float]:
+    """
+    Geef de wijzigingstijd van het bestand achter een databron.
+    
+    De mtime maakt deel uit van de cache key, zodat handmatige wijzigingen
+    aan de database of het CSV bestand zonder herstart zichtbaar worden.
+    
+    Args:
+        source_type: Genormaliseerd type databron ('database' of 'csv')
+    
+    Returns:
+        float of None: mtime, of None bij een onbekende bron of ontbrekend
+        bestand (dan wordt de cache overgeslagen)
+    """
+    paths: Dict[str, str] = {'database': DATABASE_PATH, 'csv': CSV_PATH}
+    path = paths.get(source_type)
+    
+    if path is None:
+        return None
+    
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    
+    # In WAL modus komen wijzigingen eerst in het -wal bestand terecht
+    try:
+        mtime = max(mtime, os.path.getmtime(path + '-wal'))
+    except OSError:
+        pass
+    
+    return mtime
+
+
+def _redis_key(cache_key: Tuple[str, float]) -> str:
+    """Redis key voor een cache key; de mtime maakt oude versies ongeldig."""
+    source_type, mtime = cache_key
+    return f"products:{source_type}:{mtime!r}"
+
+
+def _redis() -> Optional['redis.Redis']:
+    """Geef de Redis client, of None als Redis (even) niet gebruikt wordt."""
+    if _redis_client is None or time.monotonic() < _redis_retry_at:
+        return None
+    return _redis_client
+
+
+def _redis_failed(error: Exception) -> None:
+    """
+    Meld een Redis fout en sla Redis daarna REDIS_RETRY_DELAY seconden over.
+    
+    Args:
+        error: De opgetreden fout
+    """
+    global _redis_retry_at
+    
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY
+    # De cache is een optimalisatie: zonder Redis werkt alles nog
+    print(
+        f"Redis cache niet beschikbaar, nieuwe poging over "
+        f"{REDIS_RETRY_DELAY:.0f} seconden: {str(error)}",
+        file=sys.stderr
+    )
+
+
+def _cache_get(cache_key: Tuple[str, float]) -> Optional[bytes]:
+    """
+    Zoek een geserialiseerde response op in de cache.
+    
+    Eerst wordt de lokale TTLCache geraadpleegd, daarna Redis (indien
+    geconfigureerd). Een treffer in Redis wordt lokaal bewaard.
+    
+    Args:
+        cache_key: (source_type, mtime)
+    
+    Returns:
+        bytes of None: De response body, of None als die niet gecachet is
+    """
+    with _RESP_CACHE_LOCK:
+        body: Optional[bytes] = _RESP_CACHE.get(cache_key)
+    
+    client = _redis() if body is None else None
+    if client is not None:
+        try:
+            body = client.get(_redis_key(cache_key))
+        except redis.RedisError as e:
+            _redis_failed(e)
+        
+        if body is not None:
+            with _RESP_CACHE_LOCK:
+                _RESP_CACHE[cache_key] = body
+    
+    return body
+
+
+def _cache_set(cache_key: Tuple[str, float], body: bytes) -> None:
+    """
+    Bewaar een geserialiseerde response in de lokale cache en in Redis.
+    
+    Args:
+        cache_key: (source_type, mtime)
+        body: Volledige response body
+    """
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE[cache_key] = body
+    
+    client = _redis()
+    if client is not None:
+        try:
+            client.setex(_redis_key(cache_key), RESPONSE_CACHE_TTL, body)
+        except redis.RedisError as e:
+            _redis_failed(e)
+
+
+def _cache_stream(
+    cache_key: Tuple[str, float],
+    fragments: Iterator[bytes]
+) -> Iterator[bytes]:
+    """
+    Geef een gestreamde response door en bewaar het resultaat in de cache.
+    
+    Enkel een volledig afgelopen stream wordt gecachet; bij een afgebroken
+    verbinding blijft de cache ongewijzigd. Eindigt de stream met een
+    ValueError ("success": false), dan wordt die wel gecachet: ongeldige
+    data hangt enkel af van de inhoud van het bestand, en die is gelijk
+    voor dezelfde mtime. Een onverwachte fout (_STREAM_ERROR_END) kan
+    tijdelijk zijn en wordt niet gecachet. Wordt de response groter dan
+    RESPONSE_CACHE_MAX_BYTES, dan stopt het bufferen en wordt ze enkel
+    nog doorgegeven.
+    
+    Args:
+        cache_key: Key waaronder de response bewaard wordt
+        fragments: JSON fragmenten van iter_products_json()
+    
+    Yields:
+        bytes: Dezelfde fragmenten, ongewijzigd
+    """
+    parts: Optional[List[bytes]] = []
+    size = 0
+    
+    with closing(fragments):
+        for fragment in fragments:
+            if parts is not None:
+                size += len(fragment)
+                if size > RESPONSE_CACHE_MAX_BYTES:
+                    parts = None  # Te groot: geef het gebufferde deel vrij
+                else:
+                    parts.append(fragment)
+            yield fragment
+    
+    if not parts or parts[-1] == _STREAM_ERROR_END:
+        return
+    
+    _cache_set(cache_key, b''.join(parts))
+
+
+def iter_products_json(
+    source_type: str,
+    data_source: BaseDataSource,
+    products: Iterator[Product]
+) -> Iterator[bytes]:
+    """
+    Serialiseer producten als JSON fragmenten voor een streaming response.
+    
+    De producten worden lazy uit de bron gelezen en per batch met orjson
+    geserialiseerd. Zo staat nooit de volledige lijst in het geheugen en
+    kan de client al data ontvangen terwijl de bron nog gelezen wordt.
+    De databron wordt gesloten zodra de stream afgelopen is.
+    
+    De status staat daarom aan het einde van het document: de HTTP status
+    (200) is al verstuurd voor alle producten gelezen zijn. Blijkt een
+    later product ongeldig, of treedt er halverwege een andere fout op,
+    dan sluit de stream af met "success": false en een "error" in plaats
+    van "count". Zo ontvangt de client altijd geldige JSON en moet hij op
+    "success" controleren.
+    
+    Args:
+        source_type: Gekozen databron, wordt teruggegeven in de response
+        data_source: Databron die na afloop gesloten moet worden
+        products: Iterator over de te serialiseren producten
+    
+    Yields:
+        bytes: Opeenvolgende stukken van het JSON document
+    """
+    try:
+        yield b'{"source":' + orjson.dumps(source_type) + b',"products":['
+        
+        count = 0
+        while True:
+            try:
+                batch = list(islice(products, STREAM_BATCH_SIZE))
+                if not batch:
+                    break
+                
+                # Een lijst serialiseren en de haken wegknippen levert de
+                # komma-gescheiden objecten op in één orjson aanroep.
+                # Bewust niet orjson.dumps(batch, default=Product.to_dict):
+                # orjson serialiseert dataclasses zelf en zou dan image_path
+                # in plaats van image versturen, en met
+                # OPT_PASSTHROUGH_DATACLASS is het gemeten niet sneller dan
+                # deze map().
+                fragment = orjson.dumps(list(map(Product.to_dict, batch)))
+            
+            except ValueError as e:
+                # Ongeldige data verderop in de bron
+                yield b'],"success":false,"error":' + orjson.dumps(str(e)) + b'}'
+                return
+            
+            except Exception as e:
+                # De status 200 is al verstuurd: sluit het document netjes af
+                print(f"Onverwachte fout: {str(e)}", file=sys.stderr)
+                yield _STREAM_ERROR_END
+                return
+            
+            yield (b',' if count else b'') + fragment[1:-1]
+            count += len(batch)
+        
+        yield b'],"count":' + str(count).encode() + b',"success":true}'
+    
+    finally:
+        # Zorg ervoor dat bronnen altijd worden vrijgegeven
+        data_source.close()
+
+
+def arrow_response(catalog: 'ProductCatalog') -> Response:
+    """
+    Bouw een Apache Arrow IPC stream response met alle producten.
+    
+    Voor analytische clients (pandas, Polars) is dit efficiënter dan JSON:
+    de data wordt per kolom en met vaste types verstuurd, zodat de client
+    niets rij per rij hoeft te parsen.
+    
+    Args:
+        catalog: De te versturen producten, per kolom
+    
+    Returns:
+        Response: Arrow IPC stream met één tabel
+    """
+    # Pas hier importeren: pyarrow is zwaar en enkel nodig voor deze clients
+    import pyarrow as pa
+    
+    # Dezelfde velden als in de JSON response. De numerieke kolommen zijn
+    # al NumPy arrays en worden zonder Python lus naar Arrow overgezet.
+    table = pa.table({
+        'id': pa.array(catalog.ids, type=pa.int64()),
+        'name': pa.array(catalog.names, type=pa.string()),
+        'description': pa.array(catalog.descriptions, type=pa.string()),
+        'price': pa.array(catalog.prices, type=pa.float64()),
+        'stock': pa.array(catalog.stocks, type=pa.int64()),
+        'image': pa.array(catalog.display_images(), type=pa.string()),
+    })
+    
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    
+    return Response(
+        sink.getvalue().to_pybytes(),
+        mimetype=ARROW_STREAM_MIMETYPE,
+        headers=_VARY_ACCEPT
+    )
+
+
 @app.route('/')
 def index() -> str:
     """Render de hoofdpagina met de gebruikersinterface."""
@@ -59,63 +415,102 @@ def index() -> str:
 
 
 @app.route('/api/products', methods=['GET'])
-def get_products() -> tuple[Dict[str, Any], int]:
+def get_products() -> Response:
     """
     API endpoint voor het ophalen van producten.
     
     Query parameters:
         source (str): 'database' of 'csv' - kiest de databron
     
+    Headers:
+        Accept: met 'application/vnd.apache.arrow.stream' worden de
+        producten als Arrow IPC stream teruggegeven in plaats van JSON
+    
     Returns:
-        JSON response met lijst van producten en HTTP status code
+        Gestreamde JSON response met lijst van producten (of een Arrow IPC
+        stream), of een JSON foutmelding met bijhorende HTTP status code.
+        Een gestreamde response heeft altijd status 200; controleer daarom
+        "success" (zie iter_products_json).
     """
-    source_type: str = request.args.get('source', 'database')
+    # Eén keer normaliseren: 'Csv' en 'csv' delen zo dezelfde cache key
+    # (lokaal en in Redis) en dezelfde response
+    source_type: str = request.args.get('source', 'database').lower().strip()
+    wants_arrow: bool = request.accept_mimetypes.best_match(
+        ['application/json', ARROW_STREAM_MIMETYPE]
+    ) == ARROW_STREAM_MIMETYPE
+    
+    # Zolang het bestand niet gewijzigd is, kan de vorige response
+    # rechtstreeks opnieuw verstuurd worden
+    mtime: Optional[float] = _source_mtime(source_type)
+    cache_key: Tuple[str, float] = (source_type, mtime)
+    
+    if mtime is not None and not wants_arrow:
+        cached_body: Optional[bytes] = _cache_get(cache_key)
+        
+        if cached_body is not None:
+            return Response(
+                cached_body,
+                mimetype='application/json',
+                headers=_VARY_ACCEPT
+            )
     
     try:
         # Factory Pattern: selecteer de juiste databron gebaseerd op input
         data_source: BaseDataSource = create_data_source(source_type)
         
+        if wants_arrow:
+            try:
+                return arrow_response(data_source.get_catalog())
+            finally:
+                data_source.close()
+        
         try:
-            # Haal producten op via de gekozen bron
-            products: List[Product] = data_source.get_all_products()
-            
-            # Converteer Product objecten naar dictionaries voor JSON
-            products_data: List[Dict[str, Any]] = [
-                product.to_dict() for product in products
-            ]
-            
-            return jsonify({
-                'success': True,
-                'source': source_type,
-                'count': len(products_data),
-                'products': products_data
-            }), 200
+            # Haal producten lazy op via de gekozen bron. Het eerste product
+            # wordt al opgevraagd zodat fouten bij het openen van de bron
+            # nog als gewone foutmelding teruggegeven kunnen worden.
+            products: Iterator[Product] = data_source.iter_products()
+            first_product: List[Product] = list(islice(products, 1))
         
-        finally:
-            # Zorg ervoor dat bronnen altijd worden vrijgegeven
+        except BaseException:
             data_source.close()
+            raise
+        
+        fragments: Iterator[bytes] = iter_products_json(
+            source_type,
+            data_source,
+            chain(first_product, products)
+        )
+        
+        if mtime is not None:
+            fragments = _cache_stream(cache_key, fragments)
+        
+        return Response(
+            stream_with_context(fragments),
+            mimetype='application/json',
+            headers=_VARY_ACCEPT
+        )
     
     except ValueError as e:
         # Client fouten (ongeldige input)
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 400
+        }, 400)
     
     except FileNotFoundError as e:
         # Bestand niet gevonden
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     
     except Exception as e:
         # Server fouten
         print(f"Onverwachte fout: {str(e)}", file=sys.stderr)
-        return jsonify({
+        return json_response({
             'success': False,
-            'error': 'Er is een onverwachte fout opgetreden'
-        }), 500
+            'error': UNEXPECTED_ERROR_MESSAGE
+        }, 500)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -153,10 +548,14 @@ def internal_error(error) -> tuple[Dict[str, str], int]:
     }), 500
 
 
-if __name__ == '__main__':
-    # Zorg dat de data directory bestaat
-    os.makedirs('data', exist_ok=True)
+def check_data_files() -> None:
+    """
+    Controleer bij het opstarten of de databronnen klaar zijn voor gebruik.
     
+    Ontbrekende bestanden of een database zonder products tabel leveren een
+    waarschuwing op; de applicatie start toch, zodat de andere databron
+    bruikbaar blijft.
+    """
     # Controleer of database geïnitialiseerd is
     if not os.path.exists(DATABASE_PATH):
         print(
@@ -164,6 +563,13 @@ if __name__ == '__main__':
             "Voer 'python init_database.py' uit om de database te initialiseren.",
             file=sys.stderr
         )
+    else:
+        from data_sources.database_source import DatabaseSource
+        
+        try:
+            DatabaseSource.validate_schema(DATABASE_PATH)
+        except Exception as e:
+            print(f"WAARSCHUWING: {str(e)}", file=sys.stderr)
     
     # Controleer of CSV bestaat
     if not os.path.exists(CSV_PATH):
@@ -171,6 +577,13 @@ if __name__ == '__main__':
             "WAARSCHUWING: CSV bestand niet gevonden.",
             file=sys.stderr
         )
+
+
+if __name__ == '__main__':
+    # Zorg dat de data directory bestaat
+    os.makedirs('data', exist_ok=True)
+    
+    check_data_files()
     
     # Start de applicatie
     app.run(debug=True, port=5000, host='127.0.0.1')
@@ -5,9 +5,24 @@ Dit package bevat alle implementaties voor verschillende databronnen.
 Het Strategy Pattern wordt hier toegepast: verschillende implementaties
 (DatabaseSource, CSVSource) kunnen uitgewisseld worden zonder dat de
 rest van de applicatie aangepast moet worden.
+
+De implementaties worden lazy geïmporteerd (PEP 562): pas bij het eerste
+gebruik van bijvoorbeeld data_sources.CSVSource wordt csv_source geladen.
 """
 
-from .database_source import DatabaseSource
-from .csv_source import CSVSource
+from typing import Any
 
 __all__ = ['DatabaseSource', 'CSVSource']
+
+
+def __getattr__(name: str) -> Any:
+    """Importeer een databron implementatie bij het eerste gebruik."""
+    if name == 'DatabaseSource':
+        from .database_source import DatabaseSource
+        return DatabaseSource
+    
+    if name == 'CSVSource':
+        from .csv_source import CSVSource
+        return CSVSource
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
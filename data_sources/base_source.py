@@ -25,9 +25,12 @@ Voordelen van Python's benadering:
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List
 from models.product import Product
 
+if TYPE_CHECKING:
+    from models.catalog import ProductCatalog
+
 
 class BaseDataSource(ABC):
     """
@@ -43,6 +46,18 @@ class BaseDataSource(ABC):
     """
     
     @abstractmethod
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Lever de producten één voor één op uit de databron.
+        
+        Implementaties lezen de data lazy, zodat een response gestreamd
+        kan worden zonder de volledige lijst in het geheugen te houden.
+        
+        Yields:
+            Product: Product objecten in volgorde van de bron
+        """
+        pass
+    
     def get_all_products(self) -> List[Product]:
         """
         Haal alle producten op uit de databron.
@@ -50,7 +65,23 @@ class BaseDataSource(ABC):
         Returns:
             List[Product]: Lijst van Product objecten
         """
-        pass
+        return list(self.iter_products())
+    
+    def get_catalog(self) -> 'ProductCatalog':
+        """
+        Haal alle producten op als kolomgebaseerde ProductCatalog.
+        
+        De standaard implementatie zet de producten van iter_products()
+        om; databronnen die hun data al per kolom kunnen leveren mogen dit
+        overschrijven.
+        
+        Returns:
+            ProductCatalog: Alle producten in volgorde van de bron
+        """
+        # Pas hier importeren: NumPy is enkel nodig voor kolomgebaseerde output
+        from models.catalog import ProductCatalog
+        
+        return ProductCatalog.from_products(self.iter_products())
     
     @abstractmethod
     def close(self):
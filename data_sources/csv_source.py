@@ -9,10 +9,38 @@ tussen verschillende systemen.
 
 import csv
 import os
-from typing import List, Optional
+import sys
+from operator import itemgetter
+from typing import IO, Any, Dict, Iterator, NoReturn, Optional, Sequence, Tuple
 from models.product import Product
 from .base_source import BaseDataSource
 
+# Vanaf deze bestandsgrootte (in bytes) wordt het CSV bestand met pandas
+# ingelezen. Voor kleine bestanden is de csv module sneller klaar dan het
+# importeren van pandas alleen al duurt.
+PANDAS_MIN_FILE_SIZE: int = 1 << 20
+
+# Aantal rijen dat pandas per keer inleest, zodat het geheugengebruik
+# begrensd blijft ongeacht de grootte van het bestand
+PANDAS_CHUNK_SIZE: int = 10_000
+
+# Maximaal aantal ongeldige rijnummers in een foutmelding
+MAX_REPORTED_ROWS: int = 10
+
+# Leesbuffer van 1 MB in plaats van de standaard 8 KB, zodat grote
+# bestanden met veel minder read() systeemaanroepen ingelezen worden
+CSV_READ_BUFFER_SIZE: int = 1 << 20
+
+# Kolommen en hun types, in de volgorde van de Product constructor
+CSV_DTYPES: Dict[str, str] = {
+    'id': 'int64',
+    'name': 'string',
+    'description': 'string',
+    'price': 'float64',
+    'stock': 'int64',
+    'image_path': 'string',
+}
+
 
 class CSVSource(BaseDataSource):
     """
@@ -27,6 +55,11 @@ class CSVSource(BaseDataSource):
         """
         Initialiseer de CSV bron.
         
+        Het bestand wordt hier niet gecontroleerd: open() meldt zelf een
+        FileNotFoundError bij het inlezen. Een aparte controle vooraf kost
+        een extra systeemaanroep en kan toch achterhaald zijn tegen dat het
+        bestand geopend wordt.
+        
         Args:
             csv_path (str): Pad naar het CSV bestand
         
@@ -37,26 +70,15 @@ class CSVSource(BaseDataSource):
             raise ValueError("CSV pad mag niet leeg zijn")
         
         self.csv_path: str = csv_path
-        self._validate_file_exists()
     
-    def _validate_file_exists(self) -> None:
-        """
-        Controleer of het CSV bestand bestaat.
-        
-        Raises:
-            FileNotFoundError: Als het bestand niet bestaat
-        """
-        if not os.path.exists(self.csv_path):
-            raise FileNotFoundError(
-                f"CSV bestand niet gevonden: {self.csv_path}"
-            )
-    
-    def _parse_product_row(self, row: dict, row_number: int) -> Optional[Product]:
+    def _parse_product_row(
+        self, values: Sequence[str], row_number: int
+    ) -> Optional[Product]:
         """
         Parse een CSV rij naar een Product object.
         
         Args:
-            row: Dictionary met product data
+            values: Veldwaardes in de volgorde van CSV_DTYPES
             row_number: Rijnummer voor error reporting
         
         Returns:
@@ -66,22 +88,15 @@ class CSVSource(BaseDataSource):
             ValueError: Bij ongeldige data
         """
         try:
-            # Valideer vereiste velden
-            required_fields = ['id', 'name', 'description', 'price', 'stock', 'image_path']
-            missing_fields = [field for field in required_fields if field not in row]
-            
-            if missing_fields:
-                raise KeyError(
-                    f"Ontbrekende kolommen in rij {row_number}: {', '.join(missing_fields)}"
-                )
-            
-            # Converteer en valideer types
-            product_id = int(row['id'])
-            name = row['name'].strip()
-            description = row['description'].strip()
-            price = float(row['price'])
-            stock = int(row['stock'])
-            image_path = row['image_path'].strip()
+            # Converteer en valideer types (de kolommen zijn al eenmalig
+            # gecontroleerd in _iter_with_csv)
+            product_id, name, description, price, stock, image_path = values
+            product_id = int(product_id)
+            name = name.strip()
+            description = description.strip()
+            price = float(price)
+            stock = int(stock)
+            image_path = sys.intern(image_path.strip())
             
             # Valideer waardes
             if product_id <= 0:
@@ -96,62 +111,207 @@ class CSVSource(BaseDataSource):
             if stock < 0:
                 raise ValueError(f"Voorraad mag niet negatief zijn (rij {row_number})")
             
+            # Alle regels zijn hierboven al gecontroleerd: de lichte
+            # constructor volstaat
             return Product(
-                id=product_id,
-                name=name,
-                description=description,
-                price=price,
-                stock=stock,
-                image_path=image_path
+                product_id, name, description, price, stock, image_path
             )
         
-        except (ValueError, KeyError) as e:
+        except ValueError as e:
             raise ValueError(
                 f"Fout bij verwerken van rij {row_number}: {str(e)}"
             ) from e
     
-    def get_all_products(self) -> List[Product]:
+    def _iter_with_csv(self, file: IO[str]) -> Iterator[Product]:
         """
-        Lees alle producten uit het CSV bestand.
+        Lees de producten rij per rij in met de csv module.
         
-        Returns:
-            List[Product]: Lijst van Product objecten
+        csv.reader levert elke rij als lijst; de kolomposities worden één
+        keer uit de header bepaald. Dat vermijdt een dictionary per rij
+        zoals bij csv.DictReader.
+        
+        Args:
+            file: Geopend CSV bestand
+        
+        Yields:
+            Product: Product objecten in volgorde van het bestand
         
         Raises:
-            FileNotFoundError: Als het bestand niet bestaat
             ValueError: Bij ongeldige data in het CSV bestand
-            Exception: Bij andere fouten
         """
-        products: List[Product] = []
+        # quoting=csv.QUOTE_MINIMAL zorgt voor correcte afhandeling van quotes
+        reader = csv.reader(
+            file,
+            quoting=csv.QUOTE_MINIMAL,
+            skipinitialspace=True
+        )
+        
+        # Controleer of CSV headers aanwezig zijn
+        header = next(reader, None)
+        if not header:
+            raise ValueError(
+                "CSV bestand heeft geen headers of is leeg"
+            )
+        
+        # Valideer vereiste kolommen één keer op de header, niet per rij
+        missing_fields = [field for field in CSV_DTYPES if field not in header]
+        
+        if missing_fields:
+            raise ValueError(
+                f"Ontbrekende kolommen: {', '.join(missing_fields)}"
+            )
+        
+        # Zet de velden van een rij in C in de volgorde van CSV_DTYPES
+        column_index = {name: i for i, name in enumerate(header)}
+        pick_values = itemgetter(*(column_index[field] for field in CSV_DTYPES))
+        
+        # Verwerk elke rij
+        for row_number, row in enumerate(reader, start=2):  # Start bij 2 (na header)
+            if not row:
+                continue  # Lege regel, net als DictReader overslaan
+            
+            try:
+                values = pick_values(row)
+            except IndexError as e:
+                raise ValueError(
+                    f"Fout bij verwerken van rij {row_number}: "
+                    f"te weinig velden"
+                ) from e
+            
+            product = self._parse_product_row(values, row_number)
+            if product:
+                yield product
+    
+    def _raise_invalid_rows(
+        self,
+        invalid_index: Sequence[int],
+        checks: Sequence[Tuple[Any, str]]
+    ) -> NoReturn:
+        """
+        Meld de ongeldige rijen uit een pandas blok in één foutmelding.
+        
+        Args:
+            invalid_index: Index labels van de ongeldige rijen
+            checks: Paren (masker, melding) per validatieregel
+        
+        Raises:
+            ValueError: Altijd, met de reden voor de eerste ongeldige rij en
+                de rijnummers van maximaal MAX_REPORTED_ROWS ongeldige rijen
+        """
+        first = invalid_index[0]
+        message = next(message for mask, message in checks if mask[first])
+        
+        # De index loopt door over de blokken heen; + 2 voor de header
+        row_numbers = [str(label + 2) for label in invalid_index[:MAX_REPORTED_ROWS]]
+        
+        raise ValueError(
+            f"Fout bij verwerken van rij {first + 2}: {message} "
+            f"(ongeldige rijen: {', '.join(row_numbers)})"
+        )
+    
+    def _iter_with_pandas(self, file: IO[str]) -> Iterator[Product]:
+        """
+        Lees de producten per blok van PANDAS_CHUNK_SIZE rijen met pandas.
+        
+        pandas tokeniseert en converteert de kolommen in C. De validatie
+        gebeurt per kolom in plaats van per rij.
+        
+        Args:
+            file: Geopend CSV bestand
+        
+        Yields:
+            Product: Product objecten in volgorde van het bestand
+        
+        Raises:
+            ValueError: Bij ongeldige data in het CSV bestand
+        """
+        # Pas hier importeren: pandas is zwaar en enkel nodig voor grote bestanden
+        import pandas as pd
         
         try:
-            with open(self.csv_path, 'r', encoding='utf-8') as file:
-                # DictReader parse CSV en geeft elke rij als dictionary
-                # quoting=csv.QUOTE_MINIMAL zorgt voor correcte afhandeling van quotes
-                reader = csv.DictReader(
-                    file,
-                    quoting=csv.QUOTE_MINIMAL,
-                    skipinitialspace=True
-                )
+            chunks = pd.read_csv(
+                file,
+                usecols=list(CSV_DTYPES),
+                dtype=CSV_DTYPES,
+                skipinitialspace=True,
+                chunksize=PANDAS_CHUNK_SIZE
+            )
+        except pd.errors.EmptyDataError as e:
+            raise ValueError(
+                "CSV bestand heeft geen headers of is leeg"
+            ) from e
+        
+        with chunks:
+            for df in chunks:
+                # Kolomvolgorde vastleggen zodat rijen positioneel
+                # doorgegeven kunnen worden
+                df = df[list(CSV_DTYPES)]
+                df['name'] = df['name'].fillna('').str.strip()
+                df['description'] = df['description'].fillna('').str.strip()
+                df['image_path'] = df['image_path'].fillna('').str.strip()
+                
+                invalid_id = df['id'] <= 0
+                invalid_name = df['name'].str.len() == 0
+                # ~(>= 0) vangt ook ontbrekende prijzen (NaN) op
+                invalid_price = ~(df['price'] >= 0)
+                invalid_stock = df['stock'] < 0
+                
+                # Eén gecombineerd masker: enkel als er iets mis is, wordt
+                # er verder gezocht naar de rijen en de reden
+                invalid = invalid_id | invalid_name | invalid_price | invalid_stock
+                if invalid.any():
+                    self._raise_invalid_rows(df.index[invalid], (
+                        (invalid_id, "Product ID moet positief zijn"),
+                        (invalid_name, "Product naam mag niet leeg zijn"),
+                        (invalid_price, "Prijs mag niet negatief zijn"),
+                        (invalid_stock, "Voorraad mag niet negatief zijn"),
+                    ))
                 
-                # Controleer of CSV headers aanwezig zijn
-                if not reader.fieldnames:
-                    raise ValueError(
-                        "CSV bestand heeft geen headers of is leeg"
-                    )
+                # Gevalideerd en genormaliseerd: de lichte Product
+                # constructor volstaat. Afbeeldingen worden gedeeld via
+                # sys.intern, net als in Product.from_user_input()
+                yield from (
+                    Product(id, name, description, price, stock, sys.intern(image_path))
+                    for id, name, description, price, stock, image_path
+                    in df.itertuples(index=False, name=None)
+                )
+    
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Lees de producten lazy uit het CSV bestand.
+        
+        Yields:
+            Product: Product objecten in volgorde van het bestand
+        
+        Raises:
+            FileNotFoundError: Als het bestand niet bestaat
+            ValueError: Bij ongeldige data in het CSV bestand
+            Exception: Bij andere fouten
+        """
+        try:
+            # newline='' laat de csv module zelf regeleindes afhandelen,
+            # ook binnen velden tussen quotes
+            with open(
+                self.csv_path,
+                'r',
+                encoding='utf-8',
+                buffering=CSV_READ_BUFFER_SIZE,
+                newline=''
+            ) as file:
+                if os.fstat(file.fileno()).st_size >= PANDAS_MIN_FILE_SIZE:
+                    products = self._iter_with_pandas(file)
+                else:
+                    products = self._iter_with_csv(file)
                 
-                # Verwerk elke rij
-                for row_number, row in enumerate(reader, start=2):  # Start bij 2 (na header)
-                    product = self._parse_product_row(row, row_number)
-                    if product:
-                        products.append(product)
+                count = 0
+                for product in products:
+                    count += 1
+                    yield product
             
-            if not products:
+            if not count:
                 raise ValueError(
                     "Geen geldige producten gevonden in CSV bestand"
                 )
-            
-            return products
         
         except FileNotFoundError as e:
             raise FileNotFoundError(
@@ -163,6 +323,10 @@ class CSVSource(BaseDataSource):
                 f"Fout bij lezen van CSV bestand: {str(e)}"
             ) from e
         
+        except ValueError:
+            # Ongeldige data: laat de melding per rij ongewijzigd door
+            raise
+        
         except Exception as e:
             raise Exception(
                 f"Onverwachte fout bij lezen van CSV: {str(e)}"
@@ -13,9 +13,224 @@ volwaardige database gebruiken, maar de principes blijven hetzelfde.
 
 import sqlite3
 import os
-from typing import List, Optional
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 from models.product import Product
 from .base_source import BaseDataSource
+from .schema import IN_MEMORY, IN_MEMORY_URI, VALIDATION_TRIGGERS, normalize_sql
+
+if TYPE_CHECKING:
+    from models.catalog import ProductCatalog
+
+# PRAGMAs die eenmalig per verbinding worden uitgevoerd
+_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+# Elke thread houdt per databasebestand één langlevende verbinding bij,
+# zodat connect(), PRAGMAs en de schema-controle niet per request gebeuren.
+# De verbindingen leven zo lang als hun thread (zie _ThreadConnections).
+_local = threading.local()
+
+# Melding als de products tabel ontbreekt
+_MISSING_TABLE_MESSAGE: str = (
+    "Database bevat geen 'products' tabel. "
+    "Voer 'python init_database.py' uit."
+)
+
+# Aantal rijen dat per fetchmany() aanroep uit de database gehaald wordt
+# (cursor.arraysize). sqlite3 stapt intern toch rij per rij door het
+# resultaat; deze waarde begrenst enkel hoeveel Product objecten tegelijk
+# in het geheugen staan, tegenover de overhead per fetchmany() aanroep.
+FETCH_BATCH_SIZE: int = 500
+
+# Vaste query als constante: sqlite3 houdt per verbinding een cache van
+# voorbereide statements bij op basis van de SQL tekst. Omdat de verbinding
+# langlevend is, wordt deze query maar één keer geparsed en gepland.
+_SELECT_ALL: str = (
+    "SELECT id, name, coalesce(description, ''), price, stock, "
+    "coalesce(image_path, '') FROM products ORDER BY id"
+)
+
+
+def _has_validation_triggers(connection: sqlite3.Connection) -> bool:
+    """
+    Controleer of de products tabel exact de VALIDATION_TRIGGERS heeft.
+    
+    SQLite bewaart de tekst van elk CREATE TRIGGER statement in
+    sqlite_master. Het resultaat wordt per verbinding onthouden samen met
+    PRAGMA schema_version, dat SQLite bij elke schemawijziging verhoogt
+    (ook vanuit een ander proces). Zo kost een request enkel die PRAGMA,
+    en wordt een database die intussen aangepast of opnieuw aangemaakt is
+    toch correct beoordeeld.
+    
+    Args:
+        connection: Verbinding met de database
+    
+    Returns:
+        bool: True als alle rijen gegarandeerd aan de regels van Product voldoen
+    """
+    schema_version: int = connection.execute("PRAGMA schema_version").fetchone()[0]
+    cached: Optional[Tuple[int, bool]] = getattr(
+        connection, 'validation_triggers', None
+    )
+    if cached is not None and cached[0] == schema_version:
+        return cached[1]
+    
+    triggers = dict(connection.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'trigger' AND tbl_name = 'products'"
+    ))
+    trusted = all(
+        normalize_sql(triggers.get(name) or '') == normalize_sql(sql)
+        for name, sql in VALIDATION_TRIGGERS.items()
+    )
+    
+    if isinstance(connection, _Connection):
+        connection.validation_triggers = (schema_version, trusted)
+    return trusted
+
+
+class _Connection(sqlite3.Connection):
+    """
+    Langlevende verbinding die de controle van de triggers onthoudt.
+    
+    Attributes:
+        validation_triggers (Optional[Tuple[int, bool]]): schema_version en
+            resultaat van de laatste _has_validation_triggers()
+    """
+    
+    validation_triggers: Optional[Tuple[int, bool]] = None
+
+
+def _close_thread_connections(
+    connections: Dict[str, Tuple[sqlite3.Connection, int]],
+    owner_pid: int
+) -> None:
+    """
+    Sluit de verbindingen van een thread die gestopt is.
+    
+    Args:
+        connections: Verbindingen van de thread, per databasebestand
+        owner_pid: Proces dat de verbindingen geopend heeft
+    """
+    # Na een fork() horen geërfde verbindingen nog bij het ouderproces en
+    # mogen ze in het kindproces niet gesloten worden
+    if os.getpid() != owner_pid:
+        return
+    
+    for connection, _ in connections.values():
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass  # Negeer fouten bij sluiten
+    connections.clear()
+
+
+class _ThreadConnections:
+    """
+    Verbindingen van één thread, per databasebestand.
+    
+    Een instantie hangt aan threading.local, en threading.local geeft zijn
+    waardes vrij zodra de thread stopt. De weakref.finalize sluit op dat
+    moment de verbindingen, en anders bij het afsluiten van Python. Zo
+    laat bijvoorbeeld de Flask development server, die elk request in een
+    nieuwe thread afhandelt, geen open verbindingen achter.
+    """
+    
+    __slots__ = ('connections', '__weakref__')
+    
+    def __init__(self) -> None:
+        self.connections: Dict[str, Tuple[sqlite3.Connection, int]] = {}
+        # De finalizer mag self niet vasthouden, enkel de dict
+        weakref.finalize(
+            self, _close_thread_connections, self.connections, os.getpid()
+        )
+
+
+def _get_conn(database_path: str) -> sqlite3.Connection:
+    """
+    Geef de verbinding van de huidige thread voor een databasebestand.
+    
+    De verbinding wordt lazy aangemaakt. Wordt het bestand vervangen
+    (bijvoorbeeld door init_database.py), dan wijst de oude verbinding nog
+    naar het verwijderde bestand en wordt er een nieuwe geopend.
+    
+    Args:
+        database_path: Pad naar het SQLite database bestand, of ':memory:'
+            voor de gedeelde database in het geheugen (zie IN_MEMORY_URI)
+    
+    Returns:
+        sqlite3.Connection: Herbruikbare verbinding
+    
+    Raises:
+        FileNotFoundError: Als het bestand niet bestaat
+        sqlite3.Error: Bij database fouten
+    """
+    if database_path == IN_MEMORY:
+        # Dezelfde database als create_database(':memory:') in init_database.py
+        # (bijvoorbeeld voor tests): er is geen bestand
+        inode = 0
+        target = IN_MEMORY_URI
+    else:
+        # stat() faalt zelf met FileNotFoundError als het bestand ontbreekt
+        inode = os.stat(database_path).st_ino
+        # mode=rw: nooit stilzwijgend een lege database aanmaken
+        target = Path(database_path).absolute().as_uri() + '?mode=rw'
+    
+    holder: Optional[_ThreadConnections] = getattr(_local, 'holder', None)
+    if holder is None:
+        holder = _local.holder = _ThreadConnections()
+    connections = holder.connections
+    
+    cached = connections.get(database_path)
+    if cached is not None and cached[1] == inode:
+        return cached[0]
+    
+    # check_same_thread=False: de finalizer van _ThreadConnections kan in
+    # een andere thread lopen dan de thread die de verbinding gebruikte
+    connection: sqlite3.Connection = sqlite3.connect(
+        target,
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None,
+        factory=_Connection
+    )
+    
+    try:
+        for pragma in _PRAGMAS:
+            connection.execute(pragma)
+    
+    except BaseException:
+        connection.close()
+        raise
+    
+    if cached is not None:
+        cached[0].close()
+    
+    connections[database_path] = (connection, inode)
+    return connection
+
+
+def reset_connections() -> None:
+    """
+    Vergeet alle verbindingen die van een ouderproces geërfd zijn.
+    
+    Een SQLite verbinding mag niet over een fork() heen gebruikt worden.
+    Gunicorn roept dit aan in elke nieuwe worker (post_fork hook), zodat
+    elke worker lazy zijn eigen verbindingen opent. De geërfde verbindingen
+    worden bewust niet gesloten: ze behoren nog toe aan het ouderproces.
+    """
+    global _local
+    
+    # De oude _ThreadConnections worden vrijgegeven, maar hun finalizer
+    # sluit niets in een ander proces dan het proces dat ze opende
+    _local = threading.local()
 
 
 class DatabaseSource(BaseDataSource):
@@ -30,21 +245,63 @@ class DatabaseSource(BaseDataSource):
     
     def __init__(self, database_path: str) -> None:
         """
-        Initialiseer de database connectie.
+        Initialiseer de database bron.
+        
+        Er wordt nog geen verbinding gemaakt: die wordt pas bij het eerste
+        gebruik opgevraagd en gedeeld met andere instanties in dezelfde
+        thread.
         
         Args:
             database_path (str): Pad naar het SQLite database bestand
         
         Raises:
             ValueError: Als het pad leeg is
-            Exception: Bij database connectie fouten
         """
         if not database_path:
             raise ValueError("Database pad mag niet leeg zijn")
         
         self.database_path: str = database_path
         self.connection: Optional[sqlite3.Connection] = None
-        self._connect()
+    
+    @classmethod
+    def validate_schema(cls, database_path: str) -> None:
+        """
+        Controleer of de database een 'products' tabel bevat.
+        
+        Deze controle hoort eenmalig bij het opstarten van de applicatie
+        te gebeuren, niet bij elke verbinding of elk request. Er wordt een
+        aparte verbinding gebruikt die meteen weer gesloten wordt, zodat er
+        geen verbinding overblijft in een proces dat nog gaat forken.
+        
+        Args:
+            database_path: Pad naar het SQLite database bestand
+        
+        Raises:
+            FileNotFoundError: Als het database bestand niet bestaat
+            ValueError: Als de database geen 'products' tabel bevat
+            Exception: Bij database fouten
+        """
+        # sqlite3.connect() zou een ontbrekend bestand stilzwijgend aanmaken
+        if not os.path.exists(database_path):
+            raise FileNotFoundError(
+                f"Database bestand niet gevonden: {database_path}"
+            )
+        
+        try:
+            connection = sqlite3.connect(database_path)
+            try:
+                table = connection.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type='table' AND name='products'"
+                ).fetchone()
+            finally:
+                connection.close()
+        
+        except sqlite3.Error as e:
+            raise Exception(f"Database verbinding mislukt: {str(e)}") from e
+        
+        if table is None:
+            raise ValueError(_MISSING_TABLE_MESSAGE)
     
     def _connect(self) -> None:
         """
@@ -54,37 +311,33 @@ class DatabaseSource(BaseDataSource):
         Dit volgt het principe van Low Coupling (GRASP).
         
         Raises:
+            FileNotFoundError: Als het database bestand niet bestaat
             Exception: Bij database connectie fouten
         """
         try:
-            if not os.path.exists(self.database_path):
-                raise FileNotFoundError(
-                    f"Database bestand niet gevonden: {self.database_path}"
-                )
-            
-            self.connection = sqlite3.connect(self.database_path)
-            self.connection.row_factory = sqlite3.Row  # Voor dict-achtige toegang
-            
-            # Test de verbinding
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            
-            if not any(table['name'] == 'products' for table in tables):
-                raise ValueError(
-                    "Database bevat geen 'products' tabel. "
-                    "Voer 'python init_database.py' uit."
-                )
+            self.connection = _get_conn(self.database_path)
+        
+        except FileNotFoundError as e:
+            raise FileNotFoundError(
+                f"Database bestand niet gevonden: {self.database_path}"
+            ) from e
         
         except sqlite3.Error as e:
             raise Exception(f"Database verbinding mislukt: {str(e)}") from e
     
-    def _create_product_from_row(self, row: sqlite3.Row) -> Product:
+    def _create_product_from_row(self, row: Tuple[Any, ...]) -> Product:
         """
         Creëert een Product object uit een database rij.
         
+        De rij is een gewone tuple in de vaste kolomvolgorde van de SELECT.
+        Positioneel uitpakken is goedkoper dan sqlite3.Row op naam
+        aanspreken. SQLite dwingt zonder triggers geen types af: de
+        numerieke kolommen worden eerst omgezet (een REAL voorraad 2.5 wordt
+        2), de tekstkolommen controleert Product.from_user_input(), zodat
+        bijvoorbeeld een BLOB beschrijving als ongeldige rij geweigerd wordt.
+        
         Args:
-            row: SQLite Row object
+            row: Tuple (id, name, description, price, stock, image_path)
         
         Returns:
             Product object
@@ -93,72 +346,176 @@ class DatabaseSource(BaseDataSource):
             ValueError: Bij ongeldige data
         """
         try:
-            return Product(
-                id=int(row['id']),
-                name=str(row['name']),
-                description=str(row['description'] or ''),
-                price=float(row['price']),
-                stock=int(row['stock']),
-                image_path=str(row['image_path'] or '')
+            product_id, name, description, price, stock, image_path = row
+            return Product.from_user_input(
+                int(product_id),
+                name,
+                description or '',
+                float(price),
+                int(stock),
+                image_path or ''
             )
-        except (KeyError, ValueError, TypeError) as e:
+        except (ValueError, TypeError, OverflowError) as e:
             raise ValueError(
                 f"Ongeldige product data in database: {str(e)}"
             ) from e
     
-    def get_all_products(self) -> List[Product]:
+    def _create_valid_products(
+        self, rows: List[Tuple[Any, ...]]
+    ) -> List[Product]:
         """
-        Haal alle producten op uit de database.
+        Creëert Product objecten uit een batch rijen, maar slaat ongeldige
+        rijen over.
+        
+        Dit is het trage pad dat enkel gebruikt wordt als een batch
+        ongeldige data bevat.
+        
+        Args:
+            rows: Database rijen
         
         Returns:
-            List[Product]: Lijst van Product objecten
+            List[Product]: Producten uit de geldige rijen
+        """
+        products: List[Product] = []
+        
+        for row in rows:
+            try:
+                products.append(self._create_product_from_row(row))
+            except ValueError as e:
+                # Log maar skip ongeldige producten
+                print(f"Waarschuwing: {str(e)}")
+        
+        return products
+    
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Lever de producten één voor één op uit de database.
+        
+        De rijen worden per FETCH_BATCH_SIZE opgehaald in plaats van met
+        fetchall(), zodat nooit alle rijen tegelijk in het geheugen staan
+        en de response al kan starten tijdens het ophalen.
+        
+        Yields:
+            Product: Product objecten gesorteerd op ID
         
         Raises:
+            ValueError: Als er geen geldige producten zijn
             Exception: Bij database fouten
         """
         if not self.connection:
             self._connect()
         
         try:
+            # Enkel rijen uit een database met de validatie triggers mogen
+            # zonder controle in Python omgezet worden
+            trusted = _has_validation_triggers(self.connection)
+            
             cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT id, name, description, price, stock, image_path
-                FROM products
-                ORDER BY id
-            """)
+            cursor.arraysize = FETCH_BATCH_SIZE
+            cursor.execute(_SELECT_ALL)
             
-            products: List[Product] = []
-            for row in cursor.fetchall():
-                try:
-                    # Creator Pattern (GRASP): DatabaseSource creëert Product objecten
-                    product = self._create_product_from_row(row)
-                    products.append(product)
-                except ValueError as e:
-                    # Log maar skip ongeldige producten
-                    print(f"Waarschuwing: {str(e)}")
-                    continue
+            count = 0
+            while rows := cursor.fetchmany():
+                if trusted:
+                    # Creator Pattern (GRASP): DatabaseSource creëert Product
+                    # objecten. De triggers garanderen geldige en
+                    # genormaliseerde waardes, dus zonder validatie.
+                    products = list(map(Product.from_trusted_row, rows))
+                else:
+                    try:
+                        # Database zonder (actuele) triggers: omzetten en
+                        # volledig valideren zoals _create_product_from_row,
+                        # hier inline zonder extra methode per rij. De SELECT
+                        # maakt van NULL in description en image_path al ''.
+                        products = [
+                            Product.from_user_input(
+                                int(r[0]), r[1], r[2],
+                                float(r[3]), int(r[4]), r[5]
+                            )
+                            for r in rows
+                        ]
+                    except (ValueError, TypeError, OverflowError):
+                        # Minstens één ongeldige rij: verwerk deze batch
+                        # opnieuw rij per rij zodat enkel de ongeldige
+                        # rijen wegvallen
+                        products = self._create_valid_products(rows)
+                
+                count += len(products)
+                yield from products
             
-            if not products:
+            if not count:
                 raise ValueError(
                     "Geen geldige producten gevonden in database"
                 )
+        
+        except sqlite3.Error as e:
+            raise self._query_error(e) from e
+    
+    @staticmethod
+    def _query_error(error: sqlite3.Error) -> Exception:
+        """
+        Vertaal een sqlite3 fout bij het ophalen naar de fout voor de app.
+        
+        Args:
+            error: De opgetreden sqlite3 fout
+        
+        Returns:
+            Exception: ValueError bij een ontbrekende tabel, anders Exception
+        """
+        # De tabel wordt niet meer per verbinding gecontroleerd; geef
+        # dezelfde duidelijke melding als validate_schema()
+        if (
+            isinstance(error, sqlite3.OperationalError)
+            and str(error).startswith('no such table')
+        ):
+            return ValueError(_MISSING_TABLE_MESSAGE)
+        return Exception(f"Fout bij ophalen van producten: {str(error)}")
+    
+    def get_catalog(self) -> 'ProductCatalog':
+        """
+        Haal alle producten op als kolomgebaseerde ProductCatalog.
+        
+        Bij een database met de validatie triggers gaan de rijen met
+        fetchall() rechtstreeks naar de kolommen, zonder tussenliggende
+        Product objecten. Anders wordt via iter_products() gevalideerd.
+        
+        Returns:
+            ProductCatalog: Alle producten gesorteerd op ID
+        
+        Raises:
+            ValueError: Als er geen geldige producten zijn
+            Exception: Bij database fouten
+        """
+        # Pas hier importeren: NumPy is enkel nodig voor kolomgebaseerde output
+        from models.catalog import ProductCatalog
+        
+        if not self.connection:
+            self._connect()
+        
+        try:
+            if not _has_validation_triggers(self.connection):
+                return super().get_catalog()
             
-            return products
+            rows = self.connection.execute(_SELECT_ALL).fetchall()
         
         except sqlite3.Error as e:
-            raise Exception(
-                f"Fout bij ophalen van producten: {str(e)}"
-            ) from e
+            raise self._query_error(e) from e
+        
+        if not rows:
+            raise ValueError("Geen geldige producten gevonden in database")
+        
+        return ProductCatalog.from_rows(rows)
     
     def close(self) -> None:
-        """Sluit de database verbinding."""
-        if self.connection:
-            try:
-                self.connection.close()
-            except sqlite3.Error:
-                pass  # Negeer fouten bij sluiten
-            finally:
-                self.connection = None
+        """
+        Geef de database verbinding vrij.
+        
+        De verbinding zelf blijft open voor hergebruik door volgende
+        requests in dezelfde thread; ze wordt gesloten zodra die thread
+        stopt, of anders bij het afsluiten van Python (zie
+        _ThreadConnections).
+        """
+        self.connection = None
     
     def __enter__(self) -> 'DatabaseSource':
         """Context manager support (met 'with' statement)."""
@@ -173,5 +530,5 @@ class DatabaseSource(BaseDataSource):
         return f"DatabaseSource(database_path='{self.database_path}')"
     
     def __del__(self) -> None:
-        """Destructor om verbinding te sluiten bij garbage collection."""
+        """Destructor om verbinding vrij te geven bij garbage collection."""
         self.close()
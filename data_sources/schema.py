@@ -0,0 +1,62 @@
+"""Database Schema
+
+Dit bestand bevat de regels die de SQLite database zelf afdwingt, en de
+definities die init_database.py en DatabaseSource moeten delen.
+
+Een aparte, lichte module (enkel typing): init_database.py heeft deze
+definities nodig, maar niet de rest van database_source en het Product
+model. Zo blijft het initialisatie script snel te importeren.
+"""
+
+from typing import Dict
+
+
+# SQLite naam voor een database die enkel in het geheugen bestaat
+IN_MEMORY: str = ':memory:'
+
+# Elke gewone ':memory:' verbinding is een eigen, lege database. Via deze
+# URI met cache=shared delen alle verbindingen in hetzelfde proces één
+# database in het geheugen, zolang er minstens één verbinding open is.
+IN_MEMORY_URI: str = 'file:products?mode=memory&cache=shared'
+
+# Alle tekens die Python's str.strip() verwijdert (str.isspace()), zodat
+# de triggers dezelfde teksten weigeren als Product.from_user_input(),
+# bijvoorbeeld ook een naam die enkel uit '\u3000' bestaat
+_WHITESPACE: str = (
+    "char(9, 10, 11, 12, 13, 28, 29, 30, 31, 32, 133, 160, 5760, "
+    "8192, 8193, 8194, 8195, 8196, 8197, 8198, 8199, 8200, 8201, 8202, "
+    "8232, 8233, 8239, 8287, 12288)"
+)
+
+# Triggers die elke geschreven rij toetsen aan de regels van
+# Product.from_user_input(), inclusief de normalisatie (geen witruimte rond
+# teksten, prijs als REAL). init_database.py maakt ze aan na het laden van
+# de gevalideerde seed data. Heeft een database exact deze triggers, dan
+# voldoet elke rij al aan de regels en kan de validatie in Python bij het
+# lezen overgeslagen worden (zie DatabaseSource.iter_products).
+VALIDATION_TRIGGERS: Dict[str, str] = {
+    f"products_validate_{event.lower()}": f"""
+        CREATE TRIGGER products_validate_{event.lower()}
+        AFTER {event} ON products
+        WHEN NOT (
+            typeof(NEW.id) = 'integer' AND NEW.id > 0
+            AND typeof(NEW.name) = 'text' AND NEW.name <> ''
+            AND NEW.name = trim(NEW.name, {_WHITESPACE})
+            AND (NEW.description IS NULL OR (typeof(NEW.description) = 'text'
+                AND NEW.description = trim(NEW.description, {_WHITESPACE})))
+            AND typeof(NEW.price) = 'real' AND NEW.price >= 0
+            AND typeof(NEW.stock) = 'integer' AND NEW.stock >= 0
+            AND (NEW.image_path IS NULL OR (typeof(NEW.image_path) = 'text'
+                AND NEW.image_path = trim(NEW.image_path, {_WHITESPACE})))
+        )
+        BEGIN
+            SELECT RAISE(ABORT, 'Ongeldig product: voldoet niet aan de regels van Product');
+        END
+    """
+    for event in ('INSERT', 'UPDATE')
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """Maak SQL vergelijkbaar door verschillen in witruimte te negeren."""
+    return " ".join(sql.split())
@@ -0,0 +1,47 @@
+"""Gunicorn Configuratie
+
+Configuratie voor het draaien van de applicatie met Gunicorn in plaats
+van de Flask development server. Die handelt elk request in een eigen
+thread af, maar draait in één proces en is niet bedoeld voor productie.
+
+Usage:
+    gunicorn app:app
+
+Gunicorn leest dit bestand automatisch in vanuit de huidige directory.
+"""
+
+import importlib
+import os
+
+from data_sources import database_source
+
+# app.py importeert de databronnen pas bij het eerste request. Met
+# preload_app worden ze hier vooraf geladen, zodat niet elke worker ze
+# apart hoeft te importeren.
+for module_name in ('data_sources.csv_source', 'data_sources.database_source'):
+    importlib.import_module(module_name)
+
+bind: str = os.environ.get('GUNICORN_BIND', '127.0.0.1:5000')
+
+# Meerdere processen benutten meerdere CPU cores; binnen elk proces
+# handelen threads gelijktijdige requests af. SQLite in WAL modus laat
+# meerdere gelijktijdige lezers toe.
+workers: int = int(os.environ.get('GUNICORN_WORKERS', '4'))
+worker_class: str = 'gthread'
+threads: int = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+# Importeer de applicatie één keer in het master proces en fork daarna:
+# de geladen modules worden copy-on-write gedeeld tussen de workers
+preload_app: bool = True
+
+
+def when_ready(server) -> None:
+    """Controleer de databronnen één keer, in het master proces."""
+    from app import check_data_files
+    
+    check_data_files()
+
+
+def post_fork(server, worker) -> None:
+    """Laat elke worker zijn eigen SQLite verbindingen openen na de fork."""
+    database_source.reset_connections()
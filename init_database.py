@@ -5,62 +5,228 @@ Voer dit script één keer uit na het klonen van de repository.
 
 Usage:
     python init_database.py
+
+Het pad van de database kan met de omgevingsvariabele PRODUCTS_DB
+aangepast worden; de applicatie leest dezelfde variabele. Dat moet dus
+een bestand zijn.
+
+Een database in het geheugen werkt enkel binnen één proces, bijvoorbeeld
+in een test: create_database(':memory:') geeft een open verbinding terug.
+Zolang die open blijft, leest DatabaseSource(':memory:') dezelfde database,
+ook vanuit andere threads.
 """
 
+import csv
+import io
 import sqlite3
 import os
 import sys
-from typing import List, Tuple
-
-DATABASE_PATH: str = 'data/products.db'
-
-# Sample product data
-# Format: (id, name, description, price, stock, image_path)
-SAMPLE_PRODUCTS: List[Tuple[int, str, str, float, int, str]] = [
-    (
-        1,
-        'Laptop Dell XPS 13',
-        'Krachtige ultrabook met 13 inch scherm, Intel i7 processor en 16GB RAM',
-        1299.99,
-        15,
-        'laptop.png'
-    ),
-    (
-        2,
-        'Draadloze Muis Logitech MX Master 3',
-        'Ergonomische draadloze muis met precisie tracking en oplaadbare batterij',
-        99.99,
-        42,
-        'mouse.png'
-    ),
-    (
-        3,
-        'Mechanisch Toetsenbord Keychron K2',
-        'Compact 75% mechanisch toetsenbord met RGB verlichting en hot-swappable switches',
-        89.99,
-        28,
-        'keyboard.png'
-    ),
-    (
-        4,
-        'Monitor LG UltraWide 34 inch',
-        'Ultrawide QHD monitor (3440x1440) met IPS panel en 75Hz refresh rate',
-        449.99,
-        8,
-        'monitor.png'
-    ),
-    (
-        5,
-        'USB-C Hub Anker 7-in-1',
-        '7-poorts USB-C hub met HDMI, USB 3.0, SD kaartlezer en 100W Power Delivery',
-        54.99,
-        67,
-        'usb-hub.png'
-    ),
-]
-
-
-def create_database() -> None:
+from contextlib import closing
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Enkel de lichte schema module: database_source en het Product model
+# (met dataclasses) zijn pas nodig bij het aanmaken van de database
+from data_sources.schema import (
+    IN_MEMORY, IN_MEMORY_URI, VALIDATION_TRIGGERS, normalize_sql
+)
+
+DATABASE_PATH: str = os.environ.get('PRODUCTS_DB', 'data/products.db')
+
+# SQLite staat (vóór versie 3.32) standaard maximaal 999 parameters per
+# statement toe; met 6 kolommen per product passen er 166 rijen in één INSERT
+SQLITE_MAX_VARIABLES: int = 999
+INSERT_CHUNK_SIZE: int = SQLITE_MAX_VARIABLES // 6
+
+# INTEGER PRIMARY KEY is een alias voor de rowid: de tabel is zelf
+# op id geïndexeerd, dus ORDER BY id heeft geen extra index nodig
+CREATE_TABLE_SQL: str = '''
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        price REAL NOT NULL,
+        stock INTEGER NOT NULL,
+        image_path TEXT
+    )
+'''
+
+INSERT_SQL_PREFIX: str = (
+    "INSERT INTO products (id, name, description, price, stock, image_path) "
+    "VALUES "
+)
+
+
+def _insert_sql(rows: int) -> str:
+    """Bouw een multi-row INSERT statement voor het opgegeven aantal rijen."""
+    return INSERT_SQL_PREFIX + ", ".join(["(?, ?, ?, ?, ?, ?)"] * rows)
+
+
+# sqlite3 houdt per verbinding een cache van voorbereide statements bij,
+# met de SQL tekst als sleutel. Door voor elke volle chunk exact dezelfde
+# string te gebruiken wordt het statement één keer gecompileerd en daarna
+# hergebruikt; enkel een kortere laatste chunk krijgt een eigen statement.
+INSERT_CHUNK_SQL: str = _insert_sql(INSERT_CHUNK_SIZE)
+
+# Sample product data als CSV (zelfde formaat als data/products.csv).
+# Een bytes constante kost bij het importeren niets; de rijen worden pas
+# door iter_sample_products() geparsed, en enkel als er geseed wordt.
+SAMPLE_PRODUCTS_CSV: bytes = b"""\
+id,name,description,price,stock,image_path
+1,Laptop Dell XPS 13,"Krachtige ultrabook met 13 inch scherm, Intel i7 processor en 16GB RAM",1299.99,15,laptop.png
+2,Draadloze Muis Logitech MX Master 3,Ergonomische draadloze muis met precisie tracking en oplaadbare batterij,99.99,42,mouse.png
+3,Mechanisch Toetsenbord Keychron K2,Compact 75% mechanisch toetsenbord met RGB verlichting en hot-swappable switches,89.99,28,keyboard.png
+4,Monitor LG UltraWide 34 inch,Ultrawide QHD monitor (3440x1440) met IPS panel en 75Hz refresh rate,449.99,8,monitor.png
+5,USB-C Hub Anker 7-in-1,"7-poorts USB-C hub met HDMI, USB 3.0, SD kaartlezer en 100W Power Delivery",54.99,67,usb-hub.png
+"""
+
+# Format van een seed rij: (id, name, description, price, stock, image_path)
+ProductRow = Tuple[int, str, str, float, int, str]
+
+
+def iter_sample_products(data: bytes = SAMPLE_PRODUCTS_CSV) -> Iterator[ProductRow]:
+    """
+    Parse en valideer de seed producten één voor één.
+    
+    Elke rij gaat door Product.from_user_input(): de tabel heeft tijdens het
+    laden geen CHECK constraints, dus de controle op bijvoorbeeld negatieve
+    prijzen of voorraad gebeurt hier, samen met de omzetting naar de juiste
+    types.
+    
+    Args:
+        data: CSV data met header, standaard SAMPLE_PRODUCTS_CSV
+    
+    Yields:
+        ProductRow: Genormaliseerde rij, klaar om in te voegen
+    
+    Raises:
+        ValueError: Als een rij geen geldig product is
+    """
+    # Pas hier importeren, zie de imports bovenaan
+    from models.product import Product
+    
+    reader = csv.reader(io.StringIO(data.decode('utf-8')))
+    next(reader, None)  # header
+    
+    for product_id, name, description, price, stock, image_path in reader:
+        product = Product.from_user_input(
+            int(product_id), name, description, float(price), int(stock), image_path
+        )
+        yield (
+            product.id, product.name, product.description,
+            product.price, product.stock, product.image_path
+        )
+
+
+def insert_products(cursor: sqlite3.Cursor, products: Iterable[ProductRow]) -> int:
+    """
+    Voeg producten toe met één multi-row INSERT per INSERT_CHUNK_SIZE rijen.
+    
+    Eén statement met meerdere VALUES rijen wordt één keer voorbereid en
+    uitgevoerd, in plaats van één uitvoering per rij zoals bij executemany.
+    De rijen worden per chunk uit de iterable gehaald, dus ook een generator
+    kan rechtstreeks geladen worden.
+    
+    Args:
+        cursor: Cursor binnen een lopende transactie
+        products: Rijen (id, name, description, price, stock, image_path)
+    
+    Returns:
+        int: Aantal toegevoegde rijen
+    """
+    rows = iter(products)
+    count = 0
+    
+    while chunk := list(islice(rows, INSERT_CHUNK_SIZE)):
+        sql = (
+            INSERT_CHUNK_SQL if len(chunk) == INSERT_CHUNK_SIZE
+            else _insert_sql(len(chunk))
+        )
+        cursor.execute(sql, list(chain.from_iterable(chunk)))
+        count += len(chunk)
+    
+    return count
+
+
+def _create_schema_fast(cursor: sqlite3.Cursor) -> None:
+    """
+    Maak de products tabel zonder CHECK constraints aan.
+    
+    SQLite evalueert CHECK constraints voor elke ingevoegde rij; voor de
+    gevalideerde seed data is dat overbodig werk. De regels worden na het
+    laden door _finalize_schema() toegevoegd.
+    
+    Args:
+        cursor: Cursor binnen een lopende transactie
+    """
+    cursor.execute(CREATE_TABLE_SQL)
+
+
+def _finalize_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Voeg na het laden de regels voor de productvelden toe.
+    
+    SQLite kan geen CHECK constraint aan een bestaande tabel toevoegen
+    (ALTER TABLE ondersteunt dat niet), dus latere wijzigingen worden
+    bewaakt met triggers die dezelfde regels als het Product model
+    afdwingen. DatabaseSource slaat de validatie in Python over voor een
+    database met deze triggers.
+    
+    Args:
+        cursor: Cursor binnen een lopende transactie
+    """
+    for sql in VALIDATION_TRIGGERS.values():
+        cursor.execute(sql)
+
+
+def has_current_schema(path: str) -> bool:
+    """
+    Controleer of een bestaande database al het actuele products schema heeft.
+    
+    SQLite bewaart de tekst van elk CREATE TABLE statement in sqlite_master;
+    die wordt vergeleken met CREATE_TABLE_SQL.
+    
+    Args:
+        path: Pad naar het database bestand
+    
+    Returns:
+        bool: True als de products tabel exact volgens CREATE_TABLE_SQL bestaat
+    """
+    if not os.path.exists(path):
+        return False
+    
+    try:
+        with closing(sqlite3.connect(path)) as connection:
+            row = connection.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'products'"
+            ).fetchone()
+    except sqlite3.DatabaseError:
+        # Geen (geldige) SQLite database: opnieuw aanmaken
+        return False
+    
+    return row is not None and normalize_sql(row[0]) == normalize_sql(CREATE_TABLE_SQL)
+
+
+def _clear_products(cursor: sqlite3.Cursor) -> None:
+    """
+    Maak de bestaande products tabel leeg voor een nieuwe seed.
+    
+    De triggers worden eerst verwijderd: zonder triggers kan SQLite een
+    DELETE zonder WHERE als truncate uitvoeren in plaats van rij per rij.
+    _finalize_schema() maakt ze na het laden opnieuw aan.
+    
+    Args:
+        cursor: Cursor binnen een lopende transactie
+    """
+    for name in VALIDATION_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cursor.execute("DELETE FROM products")
+
+
+def create_database(
+    database_path: str = DATABASE_PATH
+) -> Optional[sqlite3.Connection]:
     """
     Creëert de database en de products tabel.
     
@@ -71,47 +237,107 @@ def create_database() -> None:
     - price: Prijs in euro (REAL, NOT NULL)
     - stock: Voorraad aantal (INTEGER, NOT NULL)
     - image_path: Pad naar afbeelding (TEXT)
+    
+    Args:
+        database_path: Pad naar het database bestand, of ':memory:' voor
+            de gedeelde database in het geheugen (zie IN_MEMORY_URI)
+    
+    Returns:
+        sqlite3.Connection of None: bij ':memory:' een open verbinding (de
+        database verdwijnt wanneer de laatste verbinding sluit), anders None
     """
+    in_memory = database_path == IN_MEMORY
+    
     try:
-        # Zorg dat de data directory bestaat
-        os.makedirs('data', exist_ok=True)
+        # Parse en valideer eerst: zo blijft een bestaande database bij een
+        # fout in de seed data ongemoeid. Voor deze paar rijen is een lijst
+        # in het geheugen geen probleem; insert_products() zou ook de
+        # generator zelf rechtstreeks kunnen laden.
+        products = list(iter_sample_products())
+        
+        # Een database in het geheugen heeft geen bestanden om aan te maken
+        # of op te ruimen
+        reuse_schema = False
+        
+        if not in_memory:
+            # Zorg dat de data directory bestaat
+            directory = os.path.dirname(database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            # Bij een ongewijzigd schema blijft het bestand (en de page cache
+            # ervan) behouden en wordt enkel de data vervangen
+            reuse_schema = has_current_schema(database_path)
+            
+            if not reuse_schema:
+                # Verwijder oude database als deze bestaat
+                if os.path.exists(database_path):
+                    print(f"Verwijder bestaande database: {database_path}")
+                    os.remove(database_path)
+                
+                # De applicatie gebruikt WAL modus; een achtergebleven -wal of
+                # -shm bestand hoort bij de oude database en mag niet
+                # hergebruikt worden
+                for suffix in ('-wal', '-shm'):
+                    if os.path.exists(database_path + suffix):
+                        os.remove(database_path + suffix)
         
-        # Verwijder oude database als deze bestaat
-        if os.path.exists(DATABASE_PATH):
-            print(f"Verwijder bestaande database: {DATABASE_PATH}")
-            os.remove(DATABASE_PATH)
+        if reuse_schema:
+            print(f"Schema ongewijzigd, data wordt vervangen: {database_path}")
+        else:
+            print(f"Creëren van nieuwe database: {database_path}")
         
-        # Maak verbinding en creëert database
-        print(f"Creëren van nieuwe database: {DATABASE_PATH}")
-        connection = sqlite3.connect(DATABASE_PATH)
+        # Maak verbinding (en creëert de database indien nodig)
+        # isolation_level=None: transacties worden hieronder expliciet gestart
+        connection = sqlite3.connect(
+            IN_MEMORY_URI if in_memory else database_path,
+            uri=in_memory,
+            isolation_level=None
+        )
         cursor = connection.cursor()
         
-        # Creëert products tabel
-        cursor.execute('''
-            CREATE TABLE products (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                price REAL NOT NULL CHECK(price >= 0),
-                stock INTEGER NOT NULL CHECK(stock >= 0),
-                image_path TEXT
-            )
-        ''')
-        print("Products tabel aangemaakt")
+        if not in_memory:
+            # WAL in plaats van een rollback journal met FULL synchronous:
+            # minder fsyncs bij het schrijven. journal_mode=WAL wordt in het
+            # bestand zelf bewaard en blijft dus gelden voor de applicatie;
+            # de andere PRAGMAs gelden enkel voor deze verbinding.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        
+        # Schema en data in één transactie, dus één keer committen
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        if reuse_schema:
+            _clear_products(cursor)
+        else:
+            if in_memory:
+                # Een eerder gevulde database in het geheugen kan nog open zijn
+                cursor.execute("DROP TABLE IF EXISTS products")
+            
+            # Creëert products tabel
+            _create_schema_fast(cursor)
+            print("Products tabel aangemaakt")
         
         # Voeg sample data toe
-        cursor.executemany('''
-            INSERT INTO products (id, name, description, price, stock, image_path)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', SAMPLE_PRODUCTS)
-        print(f"{len(SAMPLE_PRODUCTS)} producten toegevoegd")
+        count = insert_products(cursor, products)
+        print(f"{count} producten toegevoegd")
         
-        # Commit en sluit
-        connection.commit()
-        connection.close()
+        # Regels voor latere wijzigingen pas na het laden
+        _finalize_schema(cursor)
+        
+        cursor.execute("COMMIT")
+        
+        print(f"\nDatabase succesvol aangemaakt: {database_path}")
+        print(f"Totaal aantal producten: {count}")
         
-        print(f"\nDatabase succesvol aangemaakt: {DATABASE_PATH}")
-        print(f"Totaal aantal producten: {len(SAMPLE_PRODUCTS)}")
+        # Een database in het geheugen bestaat enkel zolang de verbinding
+        if in_memory:
+            return connection
+        
+        connection.close()
+        return None
     
     except sqlite3.Error as e:
         print(f"FOUT bij database operatie: {str(e)}", file=sys.stderr)
@@ -123,6 +349,15 @@ def create_database() -> None:
 
 
 if __name__ == '__main__':
+    # De database zou verdwijnen zodra dit script stopt
+    if DATABASE_PATH == IN_MEMORY:
+        print(
+            "FOUT: PRODUCTS_DB=:memory: werkt enkel binnen één proces; "
+            "gebruik create_database(':memory:') en de teruggegeven verbinding",
+            file=sys.stderr
+        )
+        sys.exit(1)
+    
     print("=" * 50)
     print("Database Initialisatie")
     print("=" * 50)
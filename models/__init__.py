@@ -1,8 +1,21 @@
 """Models Package
 
 Dit package bevat alle datamodellen voor de applicatie.
+
+ProductCatalog wordt lazy geïmporteerd (PEP 562), omdat het NumPy laadt.
 """
 
+from typing import Any
+
 from .product import Product
 
-__all__ = ['Product']
+__all__ = ['Product', 'ProductCatalog']
+
+
+def __getattr__(name: str) -> Any:
+    """Importeer ProductCatalog bij het eerste gebruik."""
+    if name == 'ProductCatalog':
+        from .catalog import ProductCatalog
+        return ProductCatalog
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,137 @@
+"""Product Catalog
+
+Dit bestand definieert een kolomgebaseerde (Struct-of-Arrays) opslag voor
+een lijst producten.
+
+Een List[Product] bewaart elk product als apart object (Array-of-Structs):
+een bewerking over alle producten is dan een Python lus. ProductCatalog
+bewaart per veld één kolom, met NumPy arrays voor de numerieke velden.
+Die kolommen gaan zonder Python lus naar de Arrow output van de API (zie
+arrow_response in app.py).
+
+NumPy wordt al meegeïnstalleerd met pandas (zie csv_source).
+"""
+
+import sys
+from operator import attrgetter
+from typing import Any, Iterable, List, Sequence
+
+import numpy as np
+
+from .product import Product, display_image
+
+
+# Haalt de kolomwaardes van een product op in één C-aanroep
+_product_columns = attrgetter(
+    'id', 'name', 'description', 'price', 'stock', 'image_path'
+)
+
+
+class ProductCatalog:
+    """
+    Kolomgebaseerde verzameling producten.
+    
+    Attributes:
+        ids (np.ndarray): Product ID's (int64)
+        prices (np.ndarray): Prijzen in euro (float64)
+        stocks (np.ndarray): Voorraad aantallen (int64)
+        names (List[str]): Productnamen
+        descriptions (List[str]): Productbeschrijvingen
+        image_paths (List[str]): Paden naar productafbeeldingen
+    
+    De voorraad gebruikt int64 in plaats van int32: SQLite integers zijn
+    64-bit, zodat geen enkele opgeslagen waarde kan overlopen.
+    """
+    
+    __slots__ = ('ids', 'prices', 'stocks', 'names', 'descriptions', 'image_paths')
+    
+    def __init__(
+        self,
+        ids: np.ndarray,
+        names: List[str],
+        descriptions: List[str],
+        prices: np.ndarray,
+        stocks: np.ndarray,
+        image_paths: List[str]
+    ) -> None:
+        """
+        Initialiseer een ProductCatalog met kolommen van gelijke lengte.
+        
+        Args:
+            ids: Product ID's
+            names: Productnamen
+            descriptions: Productbeschrijvingen
+            prices: Prijzen in euro
+            stocks: Voorraad aantallen
+            image_paths: Paden naar productafbeeldingen
+        
+        Raises:
+            ValueError: Als de kolommen niet even lang zijn
+        """
+        lengths = {
+            len(ids), len(names), len(descriptions),
+            len(prices), len(stocks), len(image_paths)
+        }
+        if len(lengths) > 1:
+            raise ValueError("Alle kolommen van een catalogus moeten even lang zijn")
+        
+        self.ids: np.ndarray = np.asarray(ids, dtype=np.int64)
+        self.names: List[str] = list(names)
+        self.descriptions: List[str] = list(descriptions)
+        self.prices: np.ndarray = np.asarray(prices, dtype=np.float64)
+        self.stocks: np.ndarray = np.asarray(stocks, dtype=np.int64)
+        # Afbeeldingen komen vaak terug: één gedeeld string object per naam
+        self.image_paths: List[str] = list(map(sys.intern, image_paths))
+    
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> 'ProductCatalog':
+        """
+        Zet rijen in kolomvolgorde om naar een catalogus.
+        
+        zip(*) transponeert de rijen in C naar kolommen; de numerieke
+        kolommen worden daarna in één keer naar NumPy arrays gekopieerd.
+        Er worden geen Product objecten aangemaakt.
+        
+        Args:
+            rows: Rijen (id, name, description, price, stock, image_path)
+                met reeds gevalideerde waardes
+        
+        Returns:
+            ProductCatalog: Catalogus met dezelfde producten, in volgorde
+        """
+        columns = list(zip(*rows))
+        if not columns:
+            columns = [()] * 6
+        ids, names, descriptions, prices, stocks, image_paths = columns
+        return cls(ids, names, descriptions, prices, stocks, image_paths)
+    
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> 'ProductCatalog':
+        """
+        Zet producten om naar kolommen.
+        
+        Args:
+            products: De om te zetten producten (reeds gevalideerd)
+        
+        Returns:
+            ProductCatalog: Catalogus met dezelfde producten, in volgorde
+        """
+        # attrgetter haalt de velden van elk product in één C-aanroep op
+        return cls.from_rows(list(map(_product_columns, products)))
+    
+    def __len__(self) -> int:
+        """Aantal producten in de catalogus."""
+        return len(self.names)
+    
+    def display_images(self) -> List[str]:
+        """
+        Bepaal de te tonen afbeelding voor elk product.
+        
+        Returns:
+            List[str]: Afbeeldingen in dezelfde volgorde als de producten
+        """
+        return list(map(display_image, self.image_paths))
+    
+    def __repr__(self) -> str:
+        """String representatie voor debugging."""
+        return f"ProductCatalog(products={len(self)})"
@@ -15,9 +15,83 @@ Verschil met traditionele OOP talen (zoals Java/C#):
 """
 
 import os
-from typing import Optional, Dict, Any
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, FrozenSet, Sequence, Tuple
 
 
+# Map met productafbeeldingen (relatief aan de werkmap, net als Flask's static map)
+IMAGE_DIR: str = os.path.join('static', 'images')
+
+# Hoe lang (seconden) de lijst met afbeeldingen geldig blijft. De map wijzigt
+# normaal enkel bij een deploy; de TTL zorgt dat nieuwe bestanden in
+# development toch opgepikt worden zonder herstart.
+IMAGE_CACHE_TTL: float = 60.0
+
+# Extensies die geprobeerd worden, in volgorde ('' = het pad zoals opgegeven
+# minus een bekende extensie)
+_IMAGE_EXTENSIONS: Tuple[str, ...] = ('', '.png', '.jpg', '.jpeg', '.svg')
+
+# (vervaltijd volgens time.monotonic(), bestandsnamen in IMAGE_DIR).
+# Eén tuple zodat threads altijd een consistent paar lezen.
+_image_cache: Tuple[float, FrozenSet[str]] = (0.0, frozenset())
+
+
+def refresh_image_cache() -> FrozenSet[str]:
+    """
+    Lees de bestandsnamen in IMAGE_DIR opnieuw in.
+    
+    Returns:
+        frozenset: Bestandsnamen die op dit moment in IMAGE_DIR staan
+    """
+    global _image_cache
+    try:
+        names = frozenset(os.listdir(IMAGE_DIR))
+    except OSError:
+        names = frozenset()
+    _image_cache = (time.monotonic() + IMAGE_CACHE_TTL, names)
+    return names
+
+
+def _available_images() -> FrozenSet[str]:
+    """Geef de gecachte bestandsnamen terug en ververs ze na de TTL."""
+    expires_at, names = _image_cache
+    if time.monotonic() >= expires_at:
+        return refresh_image_cache()
+    return names
+
+
+def display_image(image_path: str) -> str:
+    """
+    Bepaal de te tonen afbeelding voor een opgegeven afbeeldingspad.
+    
+    Losse functie zodat ook kolomgebaseerde code (zie ProductCatalog) de
+    afbeeldingen kan bepalen zonder Product objecten.
+    
+    Args:
+        image_path: Afbeeldingspad zoals opgeslagen bij het product
+    
+    Returns:
+        str: Bestandsnaam van de afbeelding of de placeholder
+    """
+    if image_path:
+        # Eén directory listing per TTL in plaats van een stat per
+        # extensie per product
+        available = _available_images()
+        # De basisnaam hangt niet af van de extensie: één keer berekenen
+        base_name = image_path.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').replace('.svg', '')
+        # Check common image extensions
+        for ext in _IMAGE_EXTENSIONS:
+            candidate = base_name + ext
+            if candidate in available:
+                return candidate
+    
+    # Fallback to SVG placeholder
+    return 'placeholder.svg'
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class Product:
     """
     Representeert een product uit de webwinkel.
@@ -27,33 +101,57 @@ class Product:
     van productgegevens.
     
     Attributes:
-        id (int): Uniek product ID
-        name (str): Productnaam
+        id (int): Uniek product ID (moet positief zijn)
+        name (str): Productnaam (mag niet leeg zijn)
         description (str): Productbeschrijving
-        price (float): Prijs in euro
-        stock (int): Aantal op voorraad
+        price (float): Prijs in euro (mag niet negatief zijn)
+        stock (int): Aantal op voorraad (mag niet negatief zijn)
         image_path (str): Pad naar productafbeelding
+    
+    De @dataclass decorator genereert __init__ op basis van de velden.
+    Die constructor valideert bewust niets: ongecontroleerde data gaat via
+    Product.from_user_input(), dat de regels hierboven afdwingt.
+    Dankzij slots=True krijgt een instantie geen eigen __dict__: de
+    attributen staan op vaste posities in het object. Dat scheelt geheugen
+    en allocaties wanneer er per request veel producten aangemaakt worden.
+    eq=False en repr=False behouden de eigen __eq__/__hash__ (op ID) en
+    __repr__ hieronder.
     """
     
-    def __init__(
-        self,
+    id: int
+    name: str
+    description: str
+    price: float
+    stock: int
+    image_path: str
+    
+    @classmethod
+    def from_user_input(
+        cls,
         id: int,
         name: str,
         description: str,
         price: float,
         stock: int,
         image_path: str
-    ) -> None:
+    ) -> 'Product':
         """
-        Initialiseer een Product.
+        Valideer en normaliseer ongecontroleerde waardes tot een Product.
+        
+        Product(...) zelf valideert niets, zodat data die al gecontroleerd
+        is (de CSV parser, een database met validatie triggers) niet twee
+        keer gevalideerd wordt. Alle andere input gaat via deze methode.
         
         Args:
             id: Uniek product ID (moet positief zijn)
             name: Productnaam (mag niet leeg zijn)
-            description: Productbeschrijving
+            description: Productbeschrijving (tekst of leeg)
             price: Prijs in euro (mag niet negatief zijn)
             stock: Voorraad aantal (mag niet negatief zijn)
-            image_path: Pad naar productafbeelding
+            image_path: Pad naar productafbeelding (tekst of leeg)
+        
+        Returns:
+            Product: Product met genormaliseerde waardes
         
         Raises:
             ValueError: Bij ongeldige input waardes
@@ -71,13 +169,40 @@ class Product:
         if not isinstance(stock, int) or stock < 0:
             raise ValueError(f"Voorraad mag niet negatief zijn, kreeg: {stock}")
         
-        # Assignments
-        self.id: int = id
-        self.name: str = name.strip()
-        self.description: str = description.strip() if description else ''
-        self.price: float = float(price)
-        self.stock: int = stock
-        self.image_path: str = image_path.strip() if image_path else ''
+        if description and not isinstance(description, str):
+            raise ValueError("Productbeschrijving moet tekst zijn")
+        
+        if image_path and not isinstance(image_path, str):
+            raise ValueError("Afbeeldingspad moet tekst zijn")
+        
+        # Normalisatie
+        return cls(
+            id,
+            name.strip(),
+            description.strip() if description else '',
+            float(price),
+            stock,
+            # Veel producten delen dezelfde afbeelding: sys.intern laat ze
+            # één string object delen in plaats van een kopie per product
+            sys.intern(image_path.strip()) if image_path else ''
+        )
+    
+    @classmethod
+    def from_trusted_row(cls, row: Sequence[Any]) -> 'Product':
+        """
+        Maak een Product uit een rij waarvan de waardes al gevalideerd zijn.
+        
+        Enkel bedoeld voor data die aantoonbaar al aan de regels van
+        from_user_input() voldoet (zie DatabaseSource). Alleen image_path
+        wordt, net als in from_user_input(), geïnterned.
+        
+        Args:
+            row: Rij met (id, name, description, price, stock, image_path)
+        
+        Returns:
+            Product: Product met de opgegeven waardes
+        """
+        return cls(row[0], row[1], row[2], row[3], row[4], sys.intern(row[5]))
     
     def get_display_image(self) -> str:
         """
@@ -85,21 +210,13 @@ class Product:
         
         Als de opgegeven afbeelding niet bestaat, wordt een placeholder
         icoon teruggegeven. Dit voorkomt dat binaire afbeeldingen in de
-        repository moeten worden opgeslagen.
+        repository moeten worden opgeslagen. Het bestaan wordt opgezocht in
+        een gecachte listing van IMAGE_DIR (zie refresh_image_cache()).
         
         Returns:
             str: Pad naar de afbeelding of placeholder
         """
-        if self.image_path:
-            # Check common image extensions
-            for ext in ['', '.png', '.jpg', '.jpeg', '.svg']:
-                base_name = self.image_path.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').replace('.svg', '')
-                full_path = os.path.join('static', 'images', base_name + ext)
-                if os.path.exists(full_path):
-                    return base_name + ext
-        
-        # Fallback to SVG placeholder
-        return 'placeholder.svg'
+        return display_image(self.image_path)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -108,9 +225,20 @@ class Product:
         Deze methode maakt JSON serialisatie mogelijk (DRY principle:
         herbruikbare conversie logica op één plek).
         
+        Bewust niet gememoïseerd: de API maakt per request nieuwe producten
+        aan en roept to_dict() één keer per product aan, zodat een cache
+        nooit geraakt wordt. Volledige responses worden al als bytes
+        gecachet in app.py.
+        
         Returns:
             dict: Dictionary representatie van het product
         """
+        # Bewust een dict literal: de keys zijn constanten die Python al
+        # interned, en de dict wordt in één BUILD_CONST_KEY_MAP opcode
+        # opgebouwd. dict(zip(KEYS, values)) is hier meetbaar trager;
+        # een template dict met copy() plus zes toewijzingen is even
+        # snel maar minder leesbaar, en namedtuple._asdict() is ruim
+        # vier keer trager.
         return {
             'id': self.id,
             'name': self.name,
@@ -135,6 +263,10 @@ class Product:
         """
         Geeft de prijs terug in geformatteerde string.
         
+        Bewust niet gememoïseerd, net als to_dict(): niets in de API leest
+        deze property, en een opgeslagen string zou na een wijziging van
+        price verouderd zijn.
+        
         Returns:
             str: Prijs met euro symbool
         """
@@ -147,6 +279,11 @@ class Product:
             f"price={self.price}, stock={self.stock})"
         )
     
+    # Bewust met de hand en niet via @dataclass(eq=True, unsafe_hash=True)
+    # met field(compare=False): de gegenereerde methodes zijn ook Python
+    # code en bouwen per aanroep een tuple (self.id,), waardoor hash() en
+    # set() meetbaar trager worden. frozen=True zou bovendien elke
+    # toewijzing in __init__ via object.__setattr__ laten lopen.
     def __eq__(self, other: object) -> bool:
         """Vergelijk twee Product objecten op basis van ID."""
         if not isinstance(other, Product):
@@ -55,7 +55,9 @@ async function loadProducts() {
         const response = await fetch(`/api/products?source=${currentSource}`);
         const data = await response.json();
         
-        if (!response.ok) {
+        // Een gestreamde response heeft altijd status 200: ongeldige data
+        // verderop in de bron komt als success: false binnen
+        if (!response.ok || !data.success) {
             throw new Error(data.error || 'Er is een fout opgetreden');
         }
         